@@ -1,34 +1,171 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
 import pandas as pd
 
-from prices.prices import clean_prices_table
-from stock.stock import move_columns, process_stock_report_df, create_pivot_table_df, merge_tables
+from prices.prices import PRICE_COLUMNS, clean_prices_table
+from stock.stock import CATEGORY_COLUMNS, PIVOT_INDEX_COLUMNS, move_columns, process_stock_report_df, create_pivot_table_df, merge_tables
 from utils.column_creators import create_column
 from utils.formatters import to_percentage
 from utils.formulas import markup, percentage
+from utils.cache import disk_memoize
+from utils.readers import read_excel_fast
+from utils.writers import save_dataframe
+
+
+def _memoizer(cache_dir: Optional[str]) -> Callable:
+    return disk_memoize(cache_dir) if cache_dir else (lambda func: func)
+
+
+def load_stock(stock_file_path: str, cache_dir: Optional[str] = None) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Reads and processes the stock report and builds its pivot table.
+
+    Args:
+        stock_file_path (str): Path to the raw stock report.
+        cache_dir (str, optional): Directory for the on-disk stage cache. Defaults to None (no cache).
+
+    Returns:
+        Tuple[pd.DataFrame, pd.DataFrame]: The processed stock report and its pivot table,
+                                           with the pivot index reset to columns.
+    """
+    memoize = _memoizer(cache_dir)
+
+    # Only parse the columns the pivot actually uses, with their dtypes declared up front.
+    # SKU codes stay strings: as a categorical, numeric-looking codes would get numeric categories.
+    stock_columns = PIVOT_INDEX_COLUMNS + ['STORE_CODE', 'Concept', 'AVAILABLE']
+    stock_dtypes = {col: 'category' for col in CATEGORY_COLUMNS}
+    stock_dtypes.update({'SKU_CODE': 'string', 'AVAILABLE': 'Int32'})
+
+    stock_data = memoize(process_stock_report_df)(
+        memoize(read_excel_fast)(
+            stock_file_path, header=2, usecols=stock_columns, dtype=stock_dtypes, where={'Concept': 'OUTLET'}
+        )
+    )
+    pivot_data = memoize(create_pivot_table_df)(stock_data).reset_index()
+
+    return stock_data, pivot_data
+
+
+def load_prices(prices_file_path: str, cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    Reads and cleans the prices report.
+
+    Args:
+        prices_file_path (str): Path to the raw prices report.
+        cache_dir (str, optional): Directory for the on-disk stage cache. Defaults to None (no cache).
+
+    Returns:
+        pd.DataFrame: Cleaned prices DataFrame.
+    """
+    memoize = _memoizer(cache_dir)
+
+    # SKU codes are read as strings, matching the stock side of the merge
+    price_columns = ['Plant', 'Material'] + PRICE_COLUMNS
+    price_dtypes = {'Plant': 'int32', 'Material': 'string'}
+
+    return memoize(clean_prices_table)(
+        memoize(read_excel_fast)(
+            prices_file_path, header=2, usecols=price_columns, dtype=price_dtypes, where={'Plant': 4315}
+        )
+    )
+
+
+def run_pipeline(
+    stock_file_path: str = "data/stock.xlsx",
+    prices_file_path: str = "data/prices.xlsx",
+    output_file_path: str = "data/fifth_edit_stock.xlsx",
+    intermediate_dir: Optional[str] = None,
+    cache_dir: Optional[str] = None,
+    parallel: bool = True,
+) -> pd.DataFrame:
+    """
+    Runs the whole stock report pipeline in memory and writes the result once.
+
+    Args:
+        stock_file_path (str): Path to the raw stock report. Defaults to 'data/stock.xlsx'.
+        prices_file_path (str): Path to the raw prices report. Defaults to 'data/prices.xlsx'.
+        output_file_path (str): Path of the final report. Defaults to 'data/fifth_edit_stock.xlsx'.
+        intermediate_dir (str, optional): If given, every stage result is also saved there
+                                          as Parquet for inspection, in background threads
+                                          while the report is built. Defaults to None.
+        cache_dir (str, optional): Directory for the on-disk stage cache. Every read and
+                                   transformation up to the column moves is memoized there
+                                   (create_column mutates its input), so re-runs only recompute
+                                   stages whose inputs, code or libraries changed. Entries are
+                                   never evicted. Defaults to None (no cache).
+        parallel (bool): Whether to load the stock and prices reports in two worker processes.
+                         The two branches are independent until the merge. Defaults to True.
+
+    Returns:
+        pd.DataFrame: The final report DataFrame.
+    """
+    memoize = _memoizer(cache_dir)
+
+    if parallel:
+        # openpyxl parsing is pure Python, so processes rather than threads
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            stock_future = executor.submit(load_stock, stock_file_path, cache_dir)
+            prices_future = executor.submit(load_prices, prices_file_path, cache_dir)
+            stock_data, pivot_data = stock_future.result()
+            cleaned_prices = prices_future.result()
+    else:
+        stock_data, pivot_data = load_stock(stock_file_path, cache_dir)
+        cleaned_prices = load_prices(prices_file_path, cache_dir)
+
+    df = memoize(merge_tables)(cleaned_prices, pivot_data)
+
+    # Stage dumps are independent of each other and of the rest of the pipeline; pyarrow
+    # and the zip compression release the GIL, so they are written in background threads
+    writer = None
+    stage_saves = []
+    if intermediate_dir:
+        os.makedirs(intermediate_dir, exist_ok=True)
+        stages = {
+            "stock": stock_data,
+            "pivot_table": pivot_data,
+            "prices": cleaned_prices,
+            # create_column adds columns to df in place, so dump a snapshot of it
+            "merged": df.copy(deep=False),
+        }
+        writer = ThreadPoolExecutor(max_workers=len(stages))
+        stage_saves = [
+            writer.submit(save_dataframe, stage_df, os.path.join(intermediate_dir, f"{name}.parquet"))
+            for name, stage_df in stages.items()
+        ]
+
+    try:
+        # create_column changes its argument in place, so it is not memoized
+        df = create_column(df, 'Markup', formula=markup)
+        df = memoize(move_columns)(df, 'Subgen', columns_to_move=['SalePrice', 'InitialPrice', 'PurchasePrice', 'Markup'])
+        df = create_column(df, '%', formula=percentage, after_column_name='PurchasePrice', formatter_func=to_percentage)
+
+        save_dataframe(df, output_file_path)
 
-# data_frame = pd.read_excel("data/stock.xlsx", header=2)
-# new_data_frame = process_stock_report_df(data_frame)
-# new_data_frame.to_excel("data/first_edit_stock.xlsx", index=False)
+        # Surface any error from the background writes
+        for future in stage_saves:
+            future.result()
 
-# data_frame = pd.read_excel("data/first_edit_stock.xlsx")
-# new_data_frame = create_pivot_table_df(data_frame)
-# new_data_frame.to_excel("data/second_edit_stock.xlsx")
+    finally:
+        if writer is not None:
+            writer.shutdown()
 
-# stock_data = pd.read_excel("data/second_edit_stock.xlsx")
-# prices_data = pd.read_excel("data/prices.xlsx", header=2)
-#
-# cleaned_prices = clean_prices_table(prices_data)
-#
-# merged_df = merge_tables(cleaned_prices, stock_data)
-# merged_df.to_excel("data/third_edit_stock.xlsx")
+    return df
 
-# data_frame = pd.read_excel("data/third_edit_stock.xlsx")
-# new_data = create_column(data_frame, 'Markup', formula=markup)
-# new_data_moved = move_columns(data_frame, 'Subgen', columns_to_move=['SalePrice', 'InitialPrice', 'PurchasePrice', 'Markup'])
-# new_data_moved.to_excel("data/fifth_edit_stock.xlsx")
 
-df = pd.read_excel("data/fifth_edit_stock.xlsx")
+def main() -> None:
+    """
+    Entry point: runs the pipeline with the default paths.
+    """
+    run_pipeline()
 
-df = create_column(df, '%', formula=percentage, after_column_name='PurchasePrice', formatter_func=to_percentage)
 
-df.to_excel("data/fifth_edit_stock.xlsx", index=False)
\ No newline at end of file
+if __name__ == "__main__":
+    # Configured by the entry point only, so importing the pipeline modules has no side effects
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    main()
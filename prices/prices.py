@@ -4,6 +4,12 @@ from typing import Dict, Optional, List
 
 from utils.formatters import price_to_float
 
+logger = logging.getLogger(__name__)
+
+PRICE_COLUMNS = ['SalePrice', 'InitialPrice', 'PurchasePrice']
+COLUMNS_TO_RENAME = {'Material': 'SKU_CODE'}
+REQUIRED_COLUMNS = frozenset(['Plant'] + list(COLUMNS_TO_RENAME))
+
 
 def clean_prices_table(
     df: pd.DataFrame,
@@ -28,17 +34,19 @@ def clean_prices_table(
         ValueError: If required columns are missing.
     """
     if columns_to_rename is None:
-        columns_to_rename = {'Material': 'SKU_CODE'}
+        columns_to_rename = COLUMNS_TO_RENAME
+        required_columns = REQUIRED_COLUMNS
+    else:
+        required_columns = frozenset(['Plant'] + list(columns_to_rename))
 
     if columns_to_format is None:
-        columns_to_format = ['SalePrice', 'InitialPrice', 'PurchasePrice']
+        columns_to_format = list(PRICE_COLUMNS)
         df = price_to_float(df, columns_to_format)
 
     # Check required columns exist
-    required_columns = ['Plant'] + list(columns_to_rename.keys())
-    missing = [col for col in required_columns if col not in df.columns]
+    missing = sorted(required_columns.difference(df.columns))
     if missing:
-        logging.error(f"Missing expected columns: {missing}")
+        logger.error("Missing expected columns: %s", missing)
         raise ValueError(f"Missing required columns: {missing}")
 
     try:
@@ -49,9 +57,9 @@ def clean_prices_table(
             .rename(columns=columns_to_rename)
         )
 
-        logging.info("Successfully cleaned prices table DataFrame.")
+        logger.info("Successfully cleaned prices table DataFrame.")
         return cleaned_df
 
     except Exception as e:
-        logging.error(f"Unexpected error occurred: {e}")
+        logger.error("Unexpected error occurred: %s", e)
         raise
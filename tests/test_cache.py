@@ -0,0 +1,42 @@
+import pandas as pd
+
+from utils import cache
+from utils.cache import disk_memoize
+
+
+def _double(df):
+    return df * 2
+
+
+def _use_tmp_project(tmp_path, monkeypatch, helper_source, venv_source="VERSION = 1\n"):
+    (tmp_path / "utils").mkdir(exist_ok=True)
+    (tmp_path / "utils" / "helpers.py").write_text(helper_source)
+    (tmp_path / "venv").mkdir(exist_ok=True)
+    (tmp_path / "venv" / "site.py").write_text(venv_source)
+    monkeypatch.setattr(cache, 'PROJECT_ROOT', str(tmp_path))
+    cache._environment_hash.cache_clear()
+
+
+def test_editing_any_project_module_invalidates_the_cache(tmp_path, monkeypatch):
+    cache_dir = tmp_path / ".cache"
+    df = pd.DataFrame({'a': [1, 2]})
+
+    _use_tmp_project(tmp_path, monkeypatch, "FACTOR = 2\n")
+    disk_memoize(str(cache_dir))(_double)(df)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # Same function and arguments: a hit, no new entry
+    disk_memoize(str(cache_dir))(_double)(df)
+    assert len(list(cache_dir.iterdir())) == 1
+
+    # A helper module changed: a new key
+    _use_tmp_project(tmp_path, monkeypatch, "FACTOR = 3\n")
+    disk_memoize(str(cache_dir))(_double)(df)
+    assert len(list(cache_dir.iterdir())) == 2
+
+    # Files outside the project packages (here a local venv) are not part of the key
+    _use_tmp_project(tmp_path, monkeypatch, "FACTOR = 3\n", venv_source="VERSION = 2\n")
+    disk_memoize(str(cache_dir))(_double)(df)
+    assert len(list(cache_dir.iterdir())) == 2
+
+    cache._environment_hash.cache_clear()
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import formulas
+from utils.formulas import compute_pricing_metrics, markup, markup_by_country, markup_pl, percentage
+
+
+@pytest.fixture(params=['numpy', 'numexpr', 'numba'])
+def engine(request, monkeypatch):
+    if request.param == 'numexpr':
+        if not formulas.NUMEXPR_AVAILABLE:
+            pytest.skip("numexpr is not installed")
+        monkeypatch.setattr(formulas, 'NUMEXPR_MIN_ROWS', 0)
+    else:
+        monkeypatch.setattr(formulas, 'NUMEXPR_AVAILABLE', False)
+
+    if request.param == 'numba' and not formulas.NUMBA_AVAILABLE:
+        pytest.skip("numba is not installed")
+
+    return request.param
+
+
+def _prices():
+    # Zero and missing prices give inf/NaN; the index is not a RangeIndex on purpose
+    return pd.DataFrame(
+        {
+            'SalePrice': [12.0, 24.5, 9.99, 10.0, np.nan, 7.0],
+            'PurchasePrice': [5.0, 7.3, 4.2, 0.0, 3.0, 2.0],
+            'InitialPrice': [15.0, 24.5, 12.0, 0.0, 5.0, np.nan],
+            'Country': ['BG', 'RO', 'GR', 'BG', 'RO', 'GR'],
+        },
+        index=[10, 11, 12, 13, 14, 15],
+    )
+
+
+def test_markup_series_does_not_alias_a_reused_out_buffer():
+    buffer = np.empty(2)
+    first = markup(pd.DataFrame({'SalePrice': [12.0, 24.0], 'PurchasePrice': [5.0, 5.0]}), out=buffer)
+    markup(pd.DataFrame({'SalePrice': [120.0, 240.0], 'PurchasePrice': [5.0, 5.0]}), out=buffer)
+
+    assert first.tolist() == [2.0, 4.0]
+    assert buffer.tolist() == [20.0, 40.0]
+
+
+def test_markup_array_result_is_the_out_buffer():
+    buffer = np.empty(2)
+    result = markup(pd.DataFrame({'SalePrice': [12.0, 24.0], 'PurchasePrice': [5.0, 5.0]}), out=buffer, as_series=False)
+
+    assert result is buffer
+    assert buffer.tolist() == [2.0, 4.0]
+
+
+def test_markup_matches_the_series_formula(engine):
+    df = _prices()
+
+    result = markup(df, country='RO', round_to=None, use_numba=engine == 'numba')
+
+    expected = df['SalePrice'] / 1.21 / df['PurchasePrice']
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+
+
+def test_compute_pricing_metrics_matches_markup_and_percentage(engine):
+    df = _prices()
+
+    result = compute_pricing_metrics(df, country='GR', use_numba=engine == 'numba')
+
+    pd.testing.assert_series_equal(result['Markup'], markup(df, country='GR'), check_names=False)
+    pd.testing.assert_series_equal(result['%'], percentage(df), check_names=False)
+
+
+def test_markup_by_country_matches_markup_per_country(engine):
+    df = _prices()
+
+    result = markup_by_country(df)
+
+    for country, rows in df.groupby('Country'):
+        pd.testing.assert_series_equal(result.loc[rows.index], markup(rows, country=country))
+
+
+def test_markup_by_country_gives_nan_for_unsupported_countries(engine):
+    df = _prices()
+    df['Country'] = ['BG', 'XX', None, 'BG', 'RO', 'gr']
+
+    result = markup_by_country(df)
+
+    assert result.loc[[11, 12, 15]].isna().all()
+    assert result.loc[10] == markup(df.loc[[10]]).loc[10]
+
+
+def test_markup_pl_matches_markup():
+    pl = pytest.importorskip('polars')
+    df = _prices()
+
+    result = markup_pl(pl.from_pandas(df[['SalePrice', 'PurchasePrice']]), country='RO')
+
+    np.testing.assert_array_equal(
+        result['Markup'].to_numpy(), markup(df, country='RO', as_series=False)
+    )
@@ -0,0 +1,120 @@
+import openpyxl
+import pandas as pd
+import pytest
+
+from utils import readers
+from utils.readers import read_excel_fast
+
+
+@pytest.fixture(params=[True, False], ids=['calamine', 'openpyxl'])
+def engine(request, monkeypatch):
+    if request.param and not readers.CALAMINE_AVAILABLE:
+        pytest.skip("python-calamine is not installed")
+    monkeypatch.setattr(readers, 'CALAMINE_AVAILABLE', request.param)
+    return request.param
+
+
+def _save(path, sheets, active=0):
+    workbook = openpyxl.Workbook()
+    workbook.remove(workbook.active)
+    for title, rows in sheets.items():
+        worksheet = workbook.create_sheet(title)
+        for row in rows:
+            worksheet.append(row)
+    workbook.active = active
+    workbook.save(path)
+    return str(path)
+
+
+def test_default_sheet_is_the_first_not_the_active_one(tmp_path, engine):
+    path = _save(
+        tmp_path / "book.xlsx",
+        {'Data': [['a'], [1]], 'Notes': [['note'], ['x']]},
+        active=1,
+    )
+
+    expected = pd.read_excel(path)
+    pd.testing.assert_frame_equal(read_excel_fast(path), expected)
+    pd.testing.assert_frame_equal(read_excel_fast(path, sheet_name=0), expected)
+    pd.testing.assert_frame_equal(read_excel_fast(path, sheet_name=1), pd.read_excel(path, sheet_name=1))
+
+    result = read_excel_fast(path, sheet_name=[1, 'Data'])
+    assert list(result) == [1, 'Data']
+    pd.testing.assert_frame_equal(result['Data'], expected)
+
+
+def test_engines_match_pandas_on_blank_rows_and_duplicate_headers(tmp_path, engine):
+    path = _save(
+        tmp_path / "book.xlsx",
+        {'Data': [
+            ['a', 'b', 'a', 'a.1', None, 'a'],
+            [1, 'x', 2, 3, None, 4],
+            [None] * 6,
+            [5, 'y', 6, 7, None, 8],
+            [None] * 6,
+        ]},
+    )
+
+    expected = pd.read_excel(path, engine='openpyxl')
+    assert list(expected.columns) == ['a', 'b', 'a.2', 'a.1', 'Unnamed: 4', 'a.3']
+    assert len(expected) == 3
+
+    pd.testing.assert_frame_equal(read_excel_fast(path), expected)
+    pd.testing.assert_frame_equal(read_excel_fast(path, nrows=2), expected.head(2))
+    pd.testing.assert_frame_equal(
+        read_excel_fast(path, usecols=['a', 'a.2']), expected[['a', 'a.2']]
+    )
+
+
+STOCK_ROWS = [
+    ['SKU_CODE', 'Store', 'Qty', 'Note'],
+    ['A', 'S1', 1, 'x'],
+    ['B', 'S2', 2, 'y'],
+    ['C', 'S1', 3, 'z'],
+    ['D', 'S1', 4, 'w'],
+]
+
+
+def test_where_and_usecols(tmp_path, engine):
+    path = _save(tmp_path / "book.xlsx", {'Data': STOCK_ROWS})
+
+    result = read_excel_fast(path, usecols=['SKU_CODE', 'Qty'], where={'Store': 'S1'})
+
+    expected = pd.DataFrame({'SKU_CODE': ['A', 'C', 'D'], 'Qty': [1, 3, 4]})
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    # A callable usecols gets the filter column the same way
+    result = read_excel_fast(path, usecols=lambda col: col != 'Note', where={'Store': 'S1'})
+    assert list(result.columns) == ['SKU_CODE', 'Store', 'Qty']
+    assert result['SKU_CODE'].tolist() == ['A', 'C', 'D']
+
+
+def test_nrows_is_applied_after_where(tmp_path, engine):
+    path = _save(tmp_path / "book.xlsx", {'Data': STOCK_ROWS})
+
+    result = read_excel_fast(path, nrows=2, where={'Store': 'S1'})
+    assert result['SKU_CODE'].tolist() == ['A', 'C']
+
+    result = read_excel_fast(path, nrows=2)
+    assert result['SKU_CODE'].tolist() == ['A', 'B']
+
+
+def test_unknown_where_column_raises(tmp_path, engine):
+    path = _save(tmp_path / "book.xlsx", {'Data': STOCK_ROWS})
+
+    with pytest.raises(ValueError, match="Missing filter columns"):
+        read_excel_fast(path, where={'Country': 'BG'})
+
+
+def test_dtype_and_several_sheets(tmp_path, engine):
+    path = _save(tmp_path / "book.xlsx", {'Data': STOCK_ROWS, 'Other': STOCK_ROWS[:2]})
+
+    result = read_excel_fast(
+        path, sheet_name=['Data', 'Other'], dtype={'Qty': 'int32', 'Missing': 'int8'},
+        where={'Store': 'S1'},
+    )
+
+    assert list(result) == ['Data', 'Other']
+    assert result['Data']['SKU_CODE'].tolist() == ['A', 'C', 'D']
+    assert result['Other']['SKU_CODE'].tolist() == ['A']
+    assert all(df['Qty'].dtype == 'int32' for df in result.values())
@@ -0,0 +1,137 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stock.stock import build_price_index, create_pivot_table_df, merge_tables, process_stock_report_df
+
+
+def test_process_stock_report_keeps_int64_counts_that_do_not_fit_int32():
+    df = pd.DataFrame({'Concept': ['OUTLET', 'OUTLET', 'MAIN'], 'AVAILABLE': [1, 3_000_000_000, 5]})
+
+    result = process_stock_report_df(df)
+
+    assert result['AVAILABLE'].dtype == np.int64
+    assert result['AVAILABLE'].tolist() == [1, 3_000_000_000]
+
+
+def test_process_stock_report_narrows_counts_to_int32():
+    df = pd.DataFrame({'Concept': ['OUTLET', 'OUTLET'], 'AVAILABLE': [1.0, 2.0]})
+
+    result = process_stock_report_df(df)
+
+    assert result['AVAILABLE'].dtype == np.int32
+    assert result['AVAILABLE'].tolist() == [1, 2]
+
+
+def _groupby_pivot(df, index_cols, sort):
+    return (
+        df.groupby(index_cols + ['STORE_CODE'], observed=True, sort=sort)['AVAILABLE']
+        .sum()
+        .unstack('STORE_CODE', fill_value=0)
+        .rename_axis(columns=None)
+    )
+
+
+def _pivot_input():
+    df = pd.DataFrame({
+        'SKU_CODE': ['b', 'a', 'b', None, 'c', 'a', 'c', 'a'],
+        'Brand': ['B2', 'B1', 'B2', 'B1', 'B3', 'B1', None, 'B1'],
+        'STORE_CODE': [102, 101, 101, 103, 102, 101, 104, None],
+        'AVAILABLE': [1, 2, 3, 4, 5, 6, 7, 8],
+    })
+    # create_pivot_table_df works on categorical keys; unused categories must not produce rows or columns
+    df['SKU_CODE'] = df['SKU_CODE'].astype('category')
+    df['Brand'] = df['Brand'].astype(pd.CategoricalDtype(['B0', 'B1', 'B2', 'B3']))
+    df['STORE_CODE'] = df['STORE_CODE'].astype(pd.CategoricalDtype([100.0, 101.0, 102.0, 103.0, 104.0]))
+    return df
+
+
+def test_sum_pivot_matches_groupby_unstack():
+    df = _pivot_input()
+    index_cols = ['SKU_CODE', 'Brand']
+
+    result = create_pivot_table_df(df, index_cols=index_cols)
+    expected = _groupby_pivot(df, index_cols, sort=True)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_index_type=False, check_column_type=False)
+    # Stores 103 and 104 only occur on rows with a missing key
+    assert list(result.columns) == [101.0, 102.0]
+
+
+def test_sum_pivot_matches_groupby_unstack_unsorted():
+    df = _pivot_input()
+    index_cols = ['SKU_CODE', 'Brand']
+
+    result = create_pivot_table_df(df, index_cols=index_cols, sort=False)
+    expected = _groupby_pivot(df, index_cols, sort=False)
+
+    # Row and column order are unspecified without sorting; compare the contents
+    pd.testing.assert_frame_equal(
+        result.sort_index().sort_index(axis=1),
+        expected.sort_index().sort_index(axis=1),
+        check_dtype=False, check_index_type=False, check_column_type=False,
+    )
+
+
+def test_sum_pivot_single_index_column():
+    df = pd.DataFrame({'SKU_CODE': ['x', None], 'STORE_CODE': [1, 2], 'AVAILABLE': [3, 4]})
+
+    result = create_pivot_table_df(df, index_cols=['SKU_CODE'])
+
+    assert list(result.columns) == [1]
+    assert result.loc['x', 1] == 3
+
+
+def _prices():
+    return pd.DataFrame({
+        'SKU_CODE': ['A', 'B', 'A', 'C'],
+        'SalePrice': [10.0, 20.0, 11.0, 30.0],
+        'InitialPrice': [12.0, 22.0, 13.0, 32.0],
+        'PurchasePrice': [5.0, 8.0, 6.0, 9.0],
+    })
+
+
+def _stock():
+    return pd.DataFrame({'SKU_CODE': ['A', 'B', 'X', 'A'], 'S1': [1, 2, 3, 4]})
+
+
+def test_merge_keeps_the_last_price_of_a_duplicated_sku():
+    result = merge_tables(_prices(), _stock())
+
+    assert result['SalePrice'].tolist()[:2] == [11.0, 20.0]
+    assert result['SalePrice'].iloc[3] == 11.0
+    assert np.isnan(result['SalePrice'].iloc[2])
+    assert result['S1'].tolist() == [1, 2, 3, 4]
+
+
+def test_merge_with_a_price_index_matches_a_raw_price_frame():
+    expected = merge_tables(_prices(), _stock())
+
+    result = merge_tables(build_price_index(_prices()), _stock())
+
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_merge_rejects_a_price_index_with_duplicate_keys():
+    prices = _prices().set_index('SKU_CODE')
+
+    with pytest.raises(pd.errors.MergeError):
+        merge_tables(prices, _stock())
+
+
+def test_merge_categorical_stock_key_with_string_price_keys():
+    stock = _stock()
+    stock['SKU_CODE'] = stock['SKU_CODE'].astype('category')
+
+    result = merge_tables(_prices(), stock)
+
+    # Prices for SKUs not in the stock categories (C) are dropped; stock SKUs without a price (X) get NaN
+    assert result['SKU_CODE'].tolist() == ['A', 'B', 'X', 'A']
+    assert result['SalePrice'].tolist()[:2] == [11.0, 20.0]
+    assert result['PurchasePrice'].iloc[3] == 6.0
+    assert result[['SalePrice', 'InitialPrice', 'PurchasePrice']].iloc[2].isna().all()
+    pd.testing.assert_frame_equal(
+        result.astype({'SKU_CODE': object}),
+        merge_tables(_prices(), _stock()),
+        check_dtype=False,
+    )
@@ -0,0 +1,70 @@
+import numpy as np
+import openpyxl
+import pandas as pd
+import pytest
+
+from utils import writers
+from utils.formulas import markup
+from utils.writers import save_dataframe
+
+
+def _read_back(path):
+    workbook = openpyxl.load_workbook(path, read_only=True)
+    try:
+        return [list(row) for row in workbook.active.iter_rows(values_only=True)]
+    finally:
+        workbook.close()
+
+
+def _report_with_infinite_markup():
+    df = pd.DataFrame({'SalePrice': [10.0, 12.0, -3.0], 'PurchasePrice': [0.0, 5.0, 0.0]})
+    df['Markup'] = markup(df)
+    df.loc[1, 'PurchasePrice'] = np.nan
+    return df
+
+
+EXPECTED_ROWS = [
+    ['SalePrice', 'PurchasePrice', 'Markup'],
+    [10, 0, 'inf'],
+    [12, None, 2],
+    [-3, 0, '-inf'],
+]
+
+
+@pytest.mark.skipif(not writers.XLSXWRITER_AVAILABLE, reason="xlsxwriter is not installed")
+def test_xlsxwriter_writes_infinite_values_as_text(tmp_path):
+    path = tmp_path / "report.xlsx"
+    save_dataframe(_report_with_infinite_markup(), str(path))
+
+    assert _read_back(path) == EXPECTED_ROWS
+
+
+def test_openpyxl_writes_infinite_values_as_text(tmp_path, monkeypatch):
+    monkeypatch.setattr(writers, 'XLSXWRITER_AVAILABLE', False)
+
+    path = tmp_path / "report.xlsx"
+    save_dataframe(_report_with_infinite_markup(), str(path))
+
+    assert _read_back(path) == EXPECTED_ROWS
+
+
+@pytest.mark.parametrize('use_xlsxwriter', [True, False], ids=['xlsxwriter', 'openpyxl'])
+def test_too_large_sheets_raise(tmp_path, monkeypatch, use_xlsxwriter):
+    monkeypatch.setattr(writers, 'XLSXWRITER_AVAILABLE', use_xlsxwriter and writers.XLSXWRITER_AVAILABLE)
+    monkeypatch.setattr(writers, 'EXCEL_MAX_ROWS', 4)
+    monkeypatch.setattr(writers, 'EXCEL_MAX_COLS', 3)
+    path = tmp_path / "report.xlsx"
+
+    # Header plus three rows, three columns: exactly at the limit
+    save_dataframe(pd.DataFrame({'a': [1, 2, 3], 'b': 1, 'c': 1}), str(path))
+
+    with pytest.raises(ValueError, match="too large"):
+        save_dataframe(pd.DataFrame({'a': [1, 2, 3, 4]}), str(path))
+    with pytest.raises(ValueError, match="too large"):
+        save_dataframe(pd.DataFrame({'a': [1], 'b': 1, 'c': 1, 'd': 1}), str(path))
+
+    # Index levels count as columns
+    with pytest.raises(ValueError, match="too large"):
+        save_dataframe(pd.DataFrame({'a': [1], 'b': 1, 'c': 1}), str(path), index=True)
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['report.xlsx']
@@ -0,0 +1,161 @@
+import functools
+import hashlib
+import importlib.metadata
+import inspect
+import logging
+import os
+import pickle
+from typing import Any, Callable
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Project sources, relative to PROJECT_ROOT; anything else under the root (a local venv,
+# build output, tests) cannot change a stage's result and can be large to read
+PROJECT_SOURCES = ('main.py', 'stock', 'prices', 'utils')
+
+# Libraries whose version (or absence) can change a stage's result: pandas and numpy
+# themselves, and the optional engines the readers, writers and formulas switch on
+ENVIRONMENT_PACKAGES = (
+    'pandas', 'numpy', 'openpyxl', 'pyarrow', 'python-calamine', 'xlsxwriter', 'numexpr', 'numba',
+)
+
+
+def _source_hash(func: Callable) -> str:
+    try:
+        source = inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        source = getattr(getattr(func, '__code__', None), 'co_code', b'')
+
+    return hashlib.sha256(source).hexdigest()
+
+
+def _package_version(name: str) -> Any:
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _environment_hash() -> str:
+    """
+    Hashes the source of every module in PROJECT_SOURCES together with the versions of
+    ENVIRONMENT_PACKAGES. A memoized function's result also depends on the helpers it
+    calls and on which engines are installed, none of which its own source shows.
+    """
+    digest = hashlib.sha256()
+
+    paths = []
+    for source in PROJECT_SOURCES:
+        source = os.path.join(PROJECT_ROOT, source)
+        if os.path.isfile(source):
+            paths.append(source)
+
+        for root, dirs, files in os.walk(source):
+            dirs[:] = sorted(d for d in dirs if not d.startswith('.') and d != '__pycache__')
+            paths.extend(os.path.join(root, name) for name in sorted(files) if name.endswith('.py'))
+
+    for path in paths:
+        digest.update(os.path.relpath(path, PROJECT_ROOT).encode())
+        with open(path, 'rb') as source:
+            digest.update(source.read())
+
+    digest.update(repr([(name, _package_version(name)) for name in ENVIRONMENT_PACKAGES]).encode())
+    return digest.hexdigest()
+
+
+def _normalize_arg(arg: Any) -> Any:
+    """
+    Replaces an argument with a picklable fingerprint that changes whenever
+    the value it stands for changes:
+
+    - a path to an existing file becomes (path, mtime, size);
+    - a DataFrame or Series becomes a hash of its values, index, columns and dtypes;
+    - a function becomes its qualified name and a hash of its source.
+    """
+    if isinstance(arg, (str, os.PathLike)) and os.path.isfile(arg):
+        stat = os.stat(arg)
+        return os.path.abspath(arg), stat.st_mtime_ns, stat.st_size
+
+    if isinstance(arg, (pd.DataFrame, pd.Series)):
+        digest = hashlib.sha256(pd.util.hash_pandas_object(arg, index=True).to_numpy().tobytes())
+        if isinstance(arg, pd.DataFrame):
+            digest.update(repr(list(arg.columns)).encode())
+            digest.update(repr(list(arg.dtypes.astype(str))).encode())
+        else:
+            digest.update(repr((arg.name, str(arg.dtype))).encode())
+        digest.update(repr(arg.index.names).encode())
+        return type(arg).__name__, digest.hexdigest()
+
+    if inspect.isfunction(arg):
+        return arg.__module__, arg.__qualname__, _source_hash(arg)
+
+    return arg
+
+
+def _cache_key(func: Callable, args: tuple, kwargs: dict) -> str:
+    payload = (
+        func.__module__,
+        func.__qualname__,
+        _source_hash(func),
+        _environment_hash(),
+        tuple(_normalize_arg(arg) for arg in args),
+        tuple(sorted((name, _normalize_arg(value)) for name, value in kwargs.items())),
+    )
+    return hashlib.sha256(pickle.dumps(payload)).hexdigest()
+
+
+def disk_memoize(cache_dir: str = ".cache") -> Callable:
+    """
+    Decorator factory that persists a function's results as pickles on disk.
+
+    The cache key is built from the function name, a hash of its source, its
+    arguments and a fingerprint of the environment: the source of every module in
+    PROJECT_SOURCES and the versions of pandas, numpy and the optional engines. Paths
+    to existing files are keyed on (path, mtime, size), DataFrames on a hash of their
+    contents and functions on their source. Editing an input file, the data passed in,
+    any project module or the installed libraries therefore invalidates the entries.
+    Changes made at runtime (e.g. monkeypatching) are not seen.
+
+    Entries are never evicted; delete the cache directory to reclaim the space.
+
+    Memoized functions should be pure: on a cache hit the function does not run,
+    so any side effects on its arguments are skipped.
+
+    Args:
+        cache_dir (str): Directory holding the cached results. Defaults to '.cache'.
+
+    Returns:
+        Callable: Decorator to apply to the function being memoized.
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                key = _cache_key(func, args, kwargs)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                logger.warning("Arguments of %s cannot be hashed. Skipping cache.", func.__qualname__)
+                return func(*args, **kwargs)
+
+            cache_file = os.path.join(cache_dir, f"{key}.pkl")
+
+            if os.path.exists(cache_file):
+                logger.info("Loaded cached result of %s from %s.", func.__qualname__, cache_file)
+                return pd.read_pickle(cache_file)
+
+            result = func(*args, **kwargs)
+
+            os.makedirs(cache_dir, exist_ok=True)
+            temp_file = f"{cache_file}.{os.getpid()}.tmp"
+            pd.to_pickle(result, temp_file)
+            os.replace(temp_file, cache_file)
+
+            return result
+
+        return wrapper
+
+    return decorator
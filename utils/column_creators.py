@@ -1,8 +1,9 @@
+import logging
 from typing import Callable
 
 import pandas as pd
 
-from stock.stock import move_columns
+logger = logging.getLogger(__name__)
 
 
 def create_column(
@@ -46,19 +47,32 @@ def create_column(
     Notes
     -----
     - If no formula is provided, the column will be filled with None values.
-    - Relies on `move_columns` from `stock.stock` for column reordering.
+    - The column is inserted directly at its final position, so the DataFrame
+      is not reindexed afterwards.
+
+    Raises
+    ------
+    ValueError
+        If `after_column_name` is not a column of the DataFrame.
     """
     value = None
 
     if formula:
         value = formula(dataframe, *args, **kwargs)
 
-    dataframe[column_name] = value
+    if after_column_name:
+        if after_column_name not in dataframe.columns:
+            logger.error("Column %s not found in DataFrame.", after_column_name)
+            raise ValueError(f"Missing after_column: {after_column_name}")
+
+        if column_name in dataframe.columns:
+            del dataframe[column_name]
+
+        dataframe.insert(dataframe.columns.get_loc(after_column_name) + 1, column_name, value)
+    else:
+        dataframe[column_name] = value
 
     if formatter_func:
         dataframe = formatter_func(dataframe, column_name)
 
-    if after_column_name:
-        dataframe = move_columns(dataframe, after_column_name, columns_to_move=[column_name])
-
     return dataframe
@@ -1,7 +1,21 @@
 import logging
+import re
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
 from typing import List, Optional
 
+logger = logging.getLogger(__name__)
+
+# Any character that is NOT a digit or a decimal point; compiled once for every column
+_NOT_NUMERIC = re.compile(r'[^\d.]')
+
+
+def _clean_to_float(value) -> float:
+    # Missing cells stringify to 'nan'/'None', which clean down to '' and parse as NaN
+    cleaned = _NOT_NUMERIC.sub('', str(value))
+    return float(cleaned) if cleaned else np.nan
+
 
 def price_to_float(data_frame: pd.DataFrame, needed_columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
@@ -16,33 +30,36 @@ def price_to_float(data_frame: pd.DataFrame, needed_columns: Optional[List[str]]
         pd.DataFrame: The DataFrame with the specified columns converted to float.
     """
     if needed_columns is None:
-        logging.warning("No columns specified for price conversion. Returning original DataFrame.")
+        logger.warning("No columns specified for price conversion. Returning original DataFrame.")
         return data_frame
 
     # Create a copy to avoid SettingWithCopyWarning
     df_copy = data_frame.copy()
 
+    col_set = set(df_copy.columns)
     for column in needed_columns:
-        if column in df_copy.columns:
+        if column in col_set:
+            # Cells Excel already parsed as numbers need no string cleaning
+            if is_numeric_dtype(df_copy[column]):
+                continue
+
             try:
-                # Use a single regex to remove any character that is NOT a digit or a decimal point
-                df_copy[column] = (
-                    df_copy[column]
-                    .astype(str)
-                    .str.replace(r'[^\d.]', '', regex=True)
+                # Clean and parse each string in one pass straight into a float64 array,
+                # instead of building an intermediate column of cleaned strings
+                values = df_copy[column].to_numpy(dtype=object)
+                df_copy[column] = np.fromiter(
+                    (_clean_to_float(value) for value in values), dtype=np.float64, count=len(values)
                 )
 
-                # Convert the cleaned string to a float
-                df_copy[column] = pd.to_numeric(df_copy[column])
-
             except Exception as e:
-                logging.error(f"Error converting column '{column}': {e}. Skipping this column.")
+                logger.error("Error converting column '%s': %s. Skipping this column.", column, e)
         else:
-            logging.warning(f"Column '{column}' not found in DataFrame. Skipping.")
+            logger.warning("Column '%s' not found in DataFrame. Skipping.", column)
 
     return df_copy
 
 
 def to_percentage(df: pd.DataFrame, column_name: str) -> pd.DataFrame:
-    df[column_name] = df[column_name].apply(lambda x: f"{x:.2f}%")
+    # Formats the whole column in one numpy call instead of a Python lambda per row
+    df[column_name] = np.char.mod('%.2f%%', df[column_name].to_numpy(dtype=np.float64))
     return df
\ No newline at end of file
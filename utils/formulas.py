@@ -1,6 +1,173 @@
+import functools
+import importlib.util
 import logging
+from typing import List, Optional, Union
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+# numexpr evaluates a whole expression in one cache-blocked pass, without a temporary
+# array per operator; below this many rows its setup costs more than it saves
+NUMEXPR_AVAILABLE = importlib.util.find_spec('numexpr') is not None
+NUMEXPR_MIN_ROWS = 10_000
+NUMBA_AVAILABLE = importlib.util.find_spec('numba') is not None
+
+# Strided columns (e.g. from df.iloc[::2]) are copied to contiguous memory once at
+# this size, so the arithmetic runs on unit-stride arrays
+CONTIGUOUS_MIN_ROWS = 10_000
+
+# Sale prices include VAT; markup is computed on the net price
+_VAT_DIVISOR = {'BG': 1.2, 'RO': 1.21, 'GR': 1.24}
+# Reciprocals as NumPy scalars, converted once here rather than on every call
+_INV_VAT = {country: np.float64(1.0 / divisor) for country, divisor in _VAT_DIVISOR.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _markup_kernel():
+    """
+    Compiles (on first use) a Numba kernel that computes the markup in one parallel
+    loop, with no temporary arrays. Numba is imported here so that importing this
+    module does not pay for it.
+    """
+    from numba import njit, prange
+
+    # error_model='numpy' makes x / 0 give inf/NaN like NumPy instead of raising
+    @njit(parallel=True, cache=True, error_model='numpy')
+    def kernel(sale, cost, inv_vat, out):
+        for i in prange(sale.size):
+            out[i] = sale[i] * inv_vat / cost[i]
+        return out
+
+    return kernel
+
+
+@functools.lru_cache(maxsize=None)
+def _pricing_kernel():
+    """
+    Compiles (on first use) a Numba kernel that computes the markup and the
+    percentage change together, reading each row's prices once.
+    """
+    from numba import njit, prange
+
+    @njit(parallel=True, cache=True, error_model='numpy')
+    def kernel(sale, cost, init, inv_vat):
+        mu = np.empty(sale.shape, dtype=sale.dtype)
+        percent = np.empty(sale.shape, dtype=sale.dtype)
+        for i in prange(sale.size):
+            mu[i] = sale[i] * inv_vat / cost[i]
+            percent[i] = sale[i] / init[i] - 1
+        return mu, percent
+
+    return kernel
+
+
+def _check_price_columns(df: pd.DataFrame, columns: List[str]) -> None:
+    # Probe the (hashed) column index directly; the missing list is only built on failure
+    frame_columns = df.columns
+    if not all(col in frame_columns for col in columns):
+        raise ValueError(f"Missing columns: {sorted(set(columns).difference(frame_columns))}")
+
+    # Object columns (e.g. prices left as text) would fall back to per-element Python arithmetic
+    for col in columns:
+        col_dtype = df[col].dtype
+        if not is_numeric_dtype(col_dtype):
+            raise TypeError(f"{col} must be numeric, got {col_dtype}")
+
+
+def _price_arrays(df: pd.DataFrame, columns: List[str], dtype: Optional[np.dtype] = None) -> List[np.ndarray]:
+    """
+    Returns the given columns as float arrays of one dtype: `dtype` when given,
+    float32 when every column already is float32, and float64 otherwise. Large
+    arrays are made C-contiguous.
+    """
+    if dtype is None:
+        dtype = np.float32 if all(df[col].dtype == np.float32 for col in columns) else np.float64
+
+    arrays = [df[col].to_numpy(dtype=dtype) for col in columns]
+
+    if len(df) >= CONTIGUOUS_MIN_ROWS:
+        arrays = [np.ascontiguousarray(array) for array in arrays]
+
+    return arrays
+
+
+def markup_arrays(
+        sale_prices: np.ndarray,
+        cost_prices: np.ndarray,
+        country: str = 'BG',
+        round_to: Optional[int] = 2,
+        use_numba: bool = False,
+        out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+            Calculates the markup from raw price arrays, without building a DataFrame or Series.
+
+            Args:
+                sale_prices (np.ndarray): Sale prices, VAT included.
+                cost_prices (np.ndarray): Cost prices, the same length as `sale_prices`.
+                country (str, optional): Country code used to apply VAT. Defaults to 'BG'.
+                round_to (int, optional): Number of decimals to round the result to, or None for no rounding. Defaults to 2.
+                use_numba (bool, optional): Compute with a compiled Numba kernel when numba is installed.
+                                            The first call pays for compilation, so this pays off for
+                                            repeated calls. Defaults to False.
+                out (np.ndarray, optional): Preallocated array to write the result into, with the shape and
+                                            dtype of the result. Lets callers reuse one buffer across many
+                                            calls. Defaults to None (a new array).
+
+            Returns:
+                np.ndarray: Calculated markup, in the float dtype of `sale_prices` (float64 for integer input).
+                            This is `out` when it is given.
+
+            Raises:
+                ValueError: If the country is not supported.
+        """
+
+    try:
+        inv_vat = _INV_VAT[country]
+    except KeyError:
+        raise ValueError(f"Country {country} is not supported.") from None
+
+    sale_prices = np.asarray(sale_prices)
+    cost_prices = np.asarray(cost_prices)
+    if sale_prices.dtype.kind != 'f':
+        sale_prices = sale_prices.astype(np.float64)
+    if cost_prices.dtype.kind != 'f':
+        cost_prices = cost_prices.astype(np.float64)
+    if len(sale_prices) >= CONTIGUOUS_MIN_ROWS:
+        sale_prices = np.ascontiguousarray(sale_prices)
+        cost_prices = np.ascontiguousarray(cost_prices)
+
+    # A float64 scalar would promote float32 inputs back to float64 under numexpr
+    if sale_prices.dtype != inv_vat.dtype:
+        inv_vat = sale_prices.dtype.type(inv_vat)
+
+    if out is None:
+        out = np.empty(sale_prices.shape, dtype=sale_prices.dtype)
+
+    # Every path writes into `out` with no other full-size temporaries. Zero or missing cost
+    # prices give inf/NaN, as the Series division did, without warnings. The VAT division
+    # is a multiply by its reciprocal.
+    if use_numba and NUMBA_AVAILABLE:
+        _markup_kernel()(sale_prices, cost_prices, inv_vat, out)
+    elif NUMEXPR_AVAILABLE and len(sale_prices) >= NUMEXPR_MIN_ROWS:
+        import numexpr
+
+        numexpr.evaluate(
+            "sale * inv_vat / cost",
+            local_dict={'sale': sale_prices, 'inv_vat': inv_vat, 'cost': cost_prices},
+            out=out,
+        )
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            np.multiply(sale_prices, inv_vat, out=out)
+            np.divide(out, cost_prices, out=out)
+
+    # None means no rounding: skip the extra pass rather than round to 0 decimals
+    if round_to is not None:
+        np.round(out, round_to, out=out)
+
+    return out
 
 
 def markup(
@@ -8,48 +175,115 @@ def markup(
         cost_price_column_name: str ='PurchasePrice',
         sale_price_column_name: str = 'SalePrice',
         country: str = 'BG',
-        round_to: int = 2,
-):
+        round_to: Optional[int] = 2,
+        dtype: Optional[np.dtype] = None,
+        use_numba: bool = False,
+        as_series: bool = True,
+        out: Optional[np.ndarray] = None,
+) -> Union[pd.Series, np.ndarray]:
     """
             Calculates the markup percentage and adds it as a new column to the DataFrame.
+            The arithmetic is done by `markup_arrays` on the raw column arrays.
 
             Args:
                 df (pd.DataFrame): Input data.
                 cost_price_column_name (str): Name of the cost price column.
                 sale_price_column_name (str): Name of the sale price column.
                 country (str, optional): Country code used to apply VAT. Defaults to 'BG'.
-                round_to (int, optional): Number of decimals to round the result to. Defaults to None (no rounding).
+                round_to (int, optional): Number of decimals to round the result to, or None for no rounding. Defaults to 2.
+                dtype (np.dtype, optional): Float dtype to compute in. Pass np.float32 to halve the memory
+                                            traffic on large frames. Defaults to None (float32 if both
+                                            price columns are float32, float64 otherwise).
+                use_numba (bool, optional): Compute with a compiled Numba kernel when numba is installed.
+                                            Defaults to False.
+                as_series (bool, optional): Return a Series on df's index. Pass False to get the bare
+                                            ndarray, e.g. to assign it straight to a column. Defaults to True.
+                out (np.ndarray, optional): Preallocated array to write the result into; see `markup_arrays`.
+                                            With as_series=True the Series gets its own copy, so reusing
+                                            the buffer does not change Series returned earlier.
+                                            Defaults to None.
 
             Returns:
                 Calculated markup .
+
+            Raises:
+                ValueError: If the country is not supported or a column is missing.
+                TypeError: If a price column is not numeric.
         """
 
-    vat_divisor = {'BG': 1.2, 'RO': 1.21, 'GR': 1.24, }
+    _check_price_columns(df, [cost_price_column_name, sale_price_column_name])
 
-    if country not in vat_divisor.keys():
-        raise ValueError(f"Country {country} is not supported.")
+    sale_prices, cost_prices = _price_arrays(df, [sale_price_column_name, cost_price_column_name], dtype)
+    mu = markup_arrays(sale_prices, cost_prices, country=country, round_to=round_to, use_numba=use_numba, out=out)
 
-    required_columns = [cost_price_column_name, sale_price_column_name]
+    if not as_series:
+        return mu
 
-    missing_columns = [c for c in required_columns if c not in df.columns]
+    # Without copy-on-write a Series shares the array it wraps; don't let it alias the caller's buffer
+    return pd.Series(mu if out is None else mu.copy(), index=df.index)
 
-    if missing_columns:
-        raise ValueError(f"Missing columns: {missing_columns}")
 
-    mu = (
-            df[sale_price_column_name] / vat_divisor[country] / df[cost_price_column_name]
-    )
+def markup_by_country(
+        df: pd.DataFrame,
+        country_column_name: str = 'Country',
+        cost_price_column_name: str = 'PurchasePrice',
+        sale_price_column_name: str = 'SalePrice',
+        round_to: Optional[int] = 2,
+        as_series: bool = True,
+) -> Union[pd.Series, np.ndarray]:
+    """
+            Calculates the markup of rows from several countries in one vectorized pass,
+            applying each row's own VAT rate, instead of calling `markup` once per country.
+
+            Args:
+                df (pd.DataFrame): Input data.
+                country_column_name (str): Name of the column holding each row's country code. Defaults to 'Country'.
+                cost_price_column_name (str): Name of the cost price column.
+                sale_price_column_name (str): Name of the sale price column.
+                round_to (int, optional): Number of decimals to round the result to, or None for no rounding. Defaults to 2.
+                as_series (bool, optional): Return a Series on df's index, or the bare ndarray if False. Defaults to True.
 
-    mu = mu.round(round_to)
+            Returns:
+                Calculated markup. Rows with an unsupported country get NaN.
+
+            Raises:
+                ValueError: If a column is missing.
+                TypeError: If a price column is not numeric.
+        """
+
+    if country_column_name not in df.columns:
+        raise ValueError(f"Missing columns: {[country_column_name]}")
+
+    _check_price_columns(df, [cost_price_column_name, sale_price_column_name])
+
+    sale_prices, cost_prices = _price_arrays(df, [sale_price_column_name, cost_price_column_name], np.float64)
+
+    # Per-row VAT reciprocal; countries missing from the table map to NaN
+    inv_vat = df[country_column_name].map(_INV_VAT).to_numpy(dtype=np.float64, na_value=np.nan)
 
-    return mu
+    if NUMEXPR_AVAILABLE and len(df) >= NUMEXPR_MIN_ROWS:
+        import numexpr
+
+        mu = numexpr.evaluate(
+            "sale * inv_vat / cost", local_dict={'sale': sale_prices, 'inv_vat': inv_vat, 'cost': cost_prices}
+        )
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mu = sale_prices * inv_vat / cost_prices
+
+    if round_to is not None:
+        mu = np.round(mu, round_to)
+
+    return pd.Series(mu, index=df.index) if as_series else mu
 
 
 def percentage(
         df: pd.DataFrame,
         init_price_column_name: str = 'InitialPrice',
         sale_price_column_name: str = 'SalePrice',
-):
+        dtype: Optional[np.dtype] = None,
+        as_series: bool = True,
+) -> Union[pd.Series, np.ndarray]:
     """
     Calculate the percentage change between two price columns in a DataFrame.
 
@@ -64,30 +298,150 @@ def percentage(
         The column name for the initial price (default is 'InitialPrice').
     sale_price_column_name : str, optional
         The column name for the sale price (default is 'SalePrice').
+    dtype : np.dtype, optional
+        Float dtype to compute in, e.g. np.float32 to halve the memory traffic
+        (default is float32 if both columns are float32, float64 otherwise).
+    as_series : bool, optional
+        Whether to wrap the result in a Series on the DataFrame's index; pass False
+        to get the bare ndarray (default is True).
 
     Returns
     -------
-    pd.Series
-        A Series representing the percentage change for each row.
+    pd.Series or np.ndarray
+        The percentage change for each row.
 
     Raises
     ------
     ValueError
         If either of the required columns is missing from the DataFrame.
+    TypeError
+        If either of the required columns is not numeric.
 
     Notes
     -----
     - Division by zero will result in `inf` or `NaN` values.
     - Negative values in InitialPrice can produce unexpected results.
     """
-    required_columns = [init_price_column_name, sale_price_column_name]
-    missing_columns = [c for c in required_columns if c not in df.columns]
+    _check_price_columns(df, [init_price_column_name, sale_price_column_name])
+
+    # Raw arrays skip index alignment; the result is wrapped back on the frame's index
+    sale_prices, init_prices = _price_arrays(df, [sale_price_column_name, init_price_column_name], dtype)
+
+    if NUMEXPR_AVAILABLE and len(df) >= NUMEXPR_MIN_ROWS:
+        import numexpr
+
+        percent = numexpr.evaluate("sale / init - 1", local_dict={'sale': sale_prices, 'init': init_prices})
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            percent = sale_prices / init_prices - 1
+
+    return pd.Series(percent, index=df.index) if as_series else percent
+
+
+def compute_pricing_metrics(
+        df: pd.DataFrame,
+        cost_price_column_name: str = 'PurchasePrice',
+        sale_price_column_name: str = 'SalePrice',
+        init_price_column_name: str = 'InitialPrice',
+        country: str = 'BG',
+        round_to: Optional[int] = 2,
+        markup_column_name: str = 'Markup',
+        percentage_column_name: str = '%',
+        use_numba: bool = False,
+) -> pd.DataFrame:
+    """
+            Calculates the markup and the percentage change together, reading the price
+            columns once instead of once per metric.
 
-    if missing_columns:
-        raise ValueError(f"Missing columns: {missing_columns}")
+            Args:
+                df (pd.DataFrame): Input data.
+                cost_price_column_name (str): Name of the cost price column.
+                sale_price_column_name (str): Name of the sale price column.
+                init_price_column_name (str): Name of the initial price column.
+                country (str, optional): Country code used to apply VAT. Defaults to 'BG'.
+                round_to (int, optional): Number of decimals to round the markup to, or None for no rounding. Defaults to 2.
+                markup_column_name (str, optional): Name of the markup column in the result. Defaults to 'Markup'.
+                percentage_column_name (str, optional): Name of the percentage column in the result. Defaults to '%'.
+                use_numba (bool, optional): Compute both metrics in one compiled Numba loop when numba is
+                                            installed. Defaults to False.
 
-    percent = (
-        df[sale_price_column_name] / df[init_price_column_name] - 1
+            Returns:
+                pd.DataFrame: The two metrics, on df's index. Same values as `markup` and `percentage`.
+
+            Raises:
+                ValueError: If the country is not supported or a column is missing.
+                TypeError: If a price column is not numeric.
+        """
+
+    try:
+        inv_vat = _INV_VAT[country]
+    except KeyError:
+        raise ValueError(f"Country {country} is not supported.") from None
+
+    _check_price_columns(df, [cost_price_column_name, sale_price_column_name, init_price_column_name])
+
+    sale_prices, cost_prices, init_prices = _price_arrays(
+        df, [sale_price_column_name, cost_price_column_name, init_price_column_name]
     )
+    if sale_prices.dtype != inv_vat.dtype:
+        inv_vat = sale_prices.dtype.type(inv_vat)
+
+    if use_numba and NUMBA_AVAILABLE:
+        mu, percent = _pricing_kernel()(sale_prices, cost_prices, init_prices, inv_vat)
+    elif NUMEXPR_AVAILABLE and len(df) >= NUMEXPR_MIN_ROWS:
+        import numexpr
+
+        operands = {'sale': sale_prices, 'cost': cost_prices, 'init': init_prices, 'inv_vat': inv_vat}
+        mu = numexpr.evaluate("sale * inv_vat / cost", local_dict=operands)
+        percent = numexpr.evaluate("sale / init - 1", local_dict=operands)
+    else:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mu = sale_prices * inv_vat / cost_prices
+            percent = sale_prices / init_prices - 1
+
+    if round_to is not None:
+        mu = np.round(mu, round_to)
+
+    return pd.DataFrame({markup_column_name: mu, percentage_column_name: percent}, index=df.index)
+
+
+def markup_pl(
+        df,
+        cost_price_column_name: str = 'PurchasePrice',
+        sale_price_column_name: str = 'SalePrice',
+        country: str = 'BG',
+        round_to: Optional[int] = 2,
+        column_name: str = 'Markup',
+):
+    """
+            Polars version of `markup` for callers that already hold a polars DataFrame.
+            The markup is added as a column by a single polars expression, with no
+            conversion to pandas. polars is an optional dependency, imported on call.
+
+            Args:
+                df (pl.DataFrame or pl.LazyFrame): Input data.
+                cost_price_column_name (str): Name of the cost price column.
+                sale_price_column_name (str): Name of the sale price column.
+                country (str, optional): Country code used to apply VAT. Defaults to 'BG'.
+                round_to (int, optional): Number of decimals to round the result to, or None for no rounding. Defaults to 2.
+                column_name (str, optional): Name of the new column. Defaults to 'Markup'.
+
+            Returns:
+                pl.DataFrame or pl.LazyFrame: `df` with the markup column added.
+
+            Raises:
+                ValueError: If the country is not supported.
+        """
+    import polars as pl
+
+    try:
+        inv_vat = float(_INV_VAT[country])
+    except KeyError:
+        raise ValueError(f"Country {country} is not supported.") from None
+
+    mu = pl.col(sale_price_column_name) * inv_vat / pl.col(cost_price_column_name)
+
+    if round_to is not None:
+        mu = mu.round(round_to)
 
-    return percent
+    return df.with_columns(mu.alias(column_name))
@@ -0,0 +1,293 @@
+import importlib.util
+import logging
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, List, Optional, Union
+
+import openpyxl
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CALAMINE_AVAILABLE = importlib.util.find_spec('python_calamine') is not None
+
+UseCols = Optional[Union[List[str], Callable[[str], bool]]]
+SheetName = Optional[Union[str, int, List[Union[str, int]]]]
+
+
+def _dedup_columns(columns: List[Any]) -> List[Any]:
+    # Same renaming as pd.read_excel: repeated names get a '.N' suffix that does not
+    # clash with any other name in the header, e.g. ['a', 'a', 'a.1'] -> ['a', 'a.2', 'a.1']
+    columns = list(columns)
+    counts: Dict[Any, int] = {}
+
+    for i, col in enumerate(columns):
+        original = col
+        count = counts.get(col, 0)
+        while count > 0:
+            counts[original] = count + 1
+            col = f"{original}.{count}"
+            count = count + 1 if col in columns else counts.get(col, 0)
+        columns[i] = col
+        counts[col] = count + 1
+
+    return columns
+
+
+def _frame_from_rows(
+    rows: Iterable[tuple],
+    header: int = 0,
+    usecols: UseCols = None,
+    nrows: Optional[int] = None,
+    where: Optional[Dict[str, Any]] = None,
+) -> pd.DataFrame:
+    """
+    Builds a DataFrame from an iterator of row tuples, using the row at
+    position `header` as the column names.
+
+    Matches pd.read_excel: duplicate column names are renamed 'a.1', 'a.2', ...,
+    and blank rows between data rows are kept as all-NaN rows (trailing blank
+    rows are dropped).
+
+    Args:
+        rows (Iterable[tuple]): Row values as produced by `iter_rows(values_only=True)`.
+        header (int): Zero-based row number holding the column names. Defaults to 0.
+        usecols (list or callable, optional): Column names to keep, or a predicate
+                                              called with each column name. Defaults to None (all).
+        nrows (int, optional): Maximum number of data rows to read. Defaults to None (all).
+        where (dict, optional): Mapping of column name to value; only rows equal on every
+                                column are kept. Defaults to None (all rows).
+
+    Returns:
+        pd.DataFrame: DataFrame with the selected columns and rows.
+
+    Raises:
+        ValueError: If a `where` column is not in the header.
+    """
+    rows = iter(rows)
+    header_row = next(islice(rows, header, None), None)
+
+    if header_row is None:
+        return pd.DataFrame()
+
+    # Trailing empty header cells are sheet padding, not columns
+    width = len(header_row)
+    while width and header_row[width - 1] is None:
+        width -= 1
+
+    columns = _dedup_columns([
+        name if name is not None else f"Unnamed: {i}"
+        for i, name in enumerate(header_row[:width])
+    ])
+
+    if usecols is None:
+        positions = list(range(width))
+    elif callable(usecols):
+        positions = [i for i, name in enumerate(columns) if usecols(name)]
+    else:
+        wanted = set(usecols)
+        positions = [i for i, name in enumerate(columns) if name in wanted]
+
+    where = where or {}
+    col_set = set(columns)
+    missing = [col for col in where if col not in col_set]
+    if missing:
+        logger.error("Missing filter columns: %s", missing)
+        raise ValueError(f"Missing filter columns: {missing}")
+
+    # Filter columns are looked up in the full header, so they need not be in usecols
+    filters = [(columns.index(col), value) for col, value in where.items()]
+
+    def is_blank(row: tuple) -> bool:
+        return all(value is None for value in row[:width])
+
+    records = []
+    blank_record = (None,) * len(positions)
+    # Number of records up to the last non-blank row; blank rows after it are padding
+    kept = 0
+    for row in rows:
+        if nrows is not None and len(records) >= nrows:
+            # Blank rows inside the limit are data only if the sheet goes on after them
+            if not is_blank(row) or any(not is_blank(rest) for rest in rows):
+                kept = len(records)
+            break
+
+        if len(row) < width:
+            row = row + (None,) * (width - len(row))
+
+        # Blank lines between data rows come back as all-NaN rows, as in pd.read_excel;
+        # they can never equal a filter value, so with `where` they are dropped
+        if is_blank(row):
+            if not filters:
+                records.append(blank_record)
+            continue
+
+        # Rejected rows are dropped before any Python objects are kept for them
+        if any(row[i] != value for i, value in filters):
+            continue
+
+        records.append(tuple(row[i] for i in positions))
+        kept = len(records)
+
+    del records[kept:]
+
+    df = pd.DataFrame.from_records(records, columns=[columns[i] for i in positions])
+
+    # Columns without a single value are float NaN in pd.read_excel, not object None
+    if records:
+        empty = [col for col, dtype in df.dtypes.items() if dtype == object and df[col].isna().all()]
+        if empty:
+            df = df.astype(dict.fromkeys(empty, 'float64'))
+
+    return df
+
+
+def _apply_dtype(df: pd.DataFrame, dtype: Dict[str, Any]) -> pd.DataFrame:
+    col_set = set(df.columns)
+    present = {col: col_type for col, col_type in dtype.items() if col in col_set}
+    return df.astype(present) if present else df
+
+
+def _filter_rows(
+    df: pd.DataFrame,
+    where: Dict[str, Any],
+    usecols: UseCols = None,
+    nrows: Optional[int] = None,
+) -> pd.DataFrame:
+    col_set = set(df.columns)
+    missing = [col for col in where if col not in col_set]
+    if missing:
+        logger.error("Missing filter columns: %s", missing)
+        raise ValueError(f"Missing filter columns: {missing}")
+
+    mask = pd.Series(True, index=df.index)
+    for col, value in where.items():
+        mask &= df[col].eq(value)
+
+    df = df.loc[mask].reset_index(drop=True)
+
+    # Drop filter columns that were only read to evaluate the filter
+    if isinstance(usecols, list):
+        wanted = set(usecols)
+        df = df[[col for col in df.columns if col in wanted]]
+    elif callable(usecols):
+        df = df[[col for col in df.columns if usecols(col)]]
+
+    return df.head(nrows) if nrows is not None else df
+
+
+def _worksheet(workbook: openpyxl.Workbook, sheet: Optional[Union[str, int]]) -> Any:
+    # Same lookup as pd.read_excel: None and integers are positions among the worksheets,
+    # not the sheet that happened to be active when the workbook was saved
+    if sheet is None:
+        return workbook.worksheets[0]
+    if isinstance(sheet, int):
+        return workbook.worksheets[sheet]
+    return workbook[sheet]
+
+
+def _read_excel_openpyxl(
+    path: str,
+    header: int = 0,
+    sheet_name: SheetName = None,
+    usecols: UseCols = None,
+    nrows: Optional[int] = None,
+    where: Optional[Dict[str, Any]] = None,
+) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Reads an Excel sheet through openpyxl's streaming (read-only) iterator
+    instead of materializing the whole workbook.
+    """
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+
+    try:
+        if isinstance(sheet_name, list):
+            return {
+                name: _frame_from_rows(
+                    _worksheet(workbook, name).iter_rows(values_only=True), header, usecols, nrows, where
+                )
+                for name in sheet_name
+            }
+
+        worksheet = _worksheet(workbook, sheet_name)
+        return _frame_from_rows(worksheet.iter_rows(values_only=True), header, usecols, nrows, where)
+
+    finally:
+        workbook.close()
+
+
+def read_excel_fast(
+    path: str,
+    header: int = 0,
+    sheet_name: SheetName = None,
+    usecols: UseCols = None,
+    nrows: Optional[int] = None,
+    dtype: Optional[Dict[str, Any]] = None,
+    where: Optional[Dict[str, Any]] = None,
+) -> Union[pd.DataFrame, Dict[str, pd.DataFrame]]:
+    """
+    Reads an Excel sheet with the fastest engine available.
+
+    Uses the Rust-based python-calamine engine when it is installed, and falls back
+    to openpyxl's streaming (read-only) iterator otherwise. Both avoid materializing
+    the whole workbook as the default `pd.read_excel` path does.
+
+    Args:
+        path (str): Path to the .xlsx file.
+        header (int): Zero-based row number holding the column names. Defaults to 0.
+        sheet_name (str, int or list, optional): Sheet name or zero-based sheet position,
+                                                 or a list of them to read from the same
+                                                 workbook handle. Defaults to None (the first
+                                                 sheet, regardless of which one is active).
+        usecols (list or callable, optional): Column names to keep, or a predicate
+                                              called with each column name. Defaults to None (all).
+        nrows (int, optional): Maximum number of data rows to read. Defaults to None (all).
+        dtype (dict, optional): Mapping of column name to dtype, applied while reading so
+                                known columns skip type inference. Columns missing from
+                                the sheet are ignored. Defaults to None.
+        where (dict, optional): Mapping of column name to value; only rows equal on every
+                                column are kept. On the openpyxl path rows are filtered
+                                while iterating, before they are materialized.
+                                Defaults to None (all rows).
+
+    Returns:
+        pd.DataFrame or dict: The sheet as a DataFrame, or a mapping of sheet name
+                              to DataFrame when `sheet_name` is a list.
+    """
+    if CALAMINE_AVAILABLE:
+        read_usecols = usecols
+        if where and isinstance(usecols, list):
+            read_usecols = usecols + [col for col in where if col not in usecols]
+        elif where and callable(usecols):
+            def read_usecols(col: str) -> bool:
+                return usecols(col) or col in where
+
+        result = pd.read_excel(
+            path,
+            engine='calamine',
+            header=header,
+            sheet_name=0 if sheet_name is None else sheet_name,
+            usecols=read_usecols,
+            nrows=None if where else nrows,
+            dtype=dtype,
+        )
+
+        if where:
+            if isinstance(result, dict):
+                result = {name: _filter_rows(df, where, usecols, nrows) for name, df in result.items()}
+            else:
+                result = _filter_rows(result, where, usecols, nrows)
+    else:
+        result = _read_excel_openpyxl(path, header, sheet_name, usecols, nrows, where)
+
+        if dtype:
+            if isinstance(result, dict):
+                result = {name: _apply_dtype(df, dtype) for name, df in result.items()}
+            else:
+                result = _apply_dtype(result, dtype)
+
+    if isinstance(result, dict):
+        logger.info("Successfully read sheets %s from %s.", list(result), path)
+    else:
+        logger.info("Successfully read %s rows from %s.", len(result), path)
+
+    return result
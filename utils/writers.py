@@ -0,0 +1,182 @@
+import importlib.util
+import logging
+import os
+from typing import Iterator, List
+
+import numpy as np
+import openpyxl
+import pandas as pd
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font
+
+logger = logging.getLogger(__name__)
+
+XLSXWRITER_AVAILABLE = importlib.util.find_spec('xlsxwriter') is not None
+
+# Largest worksheet Excel can open, as checked by DataFrame.to_excel
+EXCEL_MAX_ROWS = 1_048_576
+EXCEL_MAX_COLS = 16_384
+
+
+def _to_rows(df: pd.DataFrame) -> List[list]:
+    """
+    Converts a block of rows to plain Python lists in one pass, with missing
+    values as None so they are written as blank cells and infinite values as
+    the text 'inf'/'-inf', like DataFrame.to_excel.
+    """
+    # Single-dtype frames come back column-major (a transposed block) and, under
+    # copy-on-write, read-only; rows are written one at a time and missing cells are
+    # blanked in place, so get a writable, row-contiguous array (copying only if needed)
+    values = np.require(df.to_numpy(dtype=object), requirements=['C', 'W'])
+    values[df.isna().to_numpy()] = None
+
+    # Excel has no infinite numbers (xlsxwriter raises, openpyxl writes an empty value),
+    # so write them as text, like DataFrame.to_excel's inf_rep
+    for position, dtype in enumerate(df.dtypes):
+        if dtype.kind != 'f':
+            continue
+        column = df.iloc[:, position].to_numpy(dtype=np.float64, na_value=np.nan)
+        infinite = np.isinf(column)
+        if infinite.any():
+            values[infinite, position] = np.where(column[infinite] > 0, 'inf', '-inf')
+
+    return values.tolist()
+
+
+def _header(df: pd.DataFrame, index: bool) -> list:
+    # Same names reset_index would give the index levels, taken from an empty slice
+    return (df.iloc[:0].reset_index() if index else df).columns.tolist()
+
+
+def _iter_rows(df: pd.DataFrame, chunk_size: int, index: bool) -> Iterator[list]:
+    for start in range(0, len(df), chunk_size):
+        block = df.iloc[start:start + chunk_size]
+
+        # Index levels are turned into columns one chunk at a time, not for the whole frame
+        if index:
+            block = block.reset_index()
+
+        yield from _to_rows(block)
+
+
+def _write_excel_xlsxwriter(df: pd.DataFrame, path: str, chunk_size: int, index: bool) -> None:
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(
+        path,
+        {'constant_memory': True, 'default_date_format': 'yyyy-mm-dd hh:mm:ss'},
+    )
+
+    try:
+        worksheet = workbook.add_worksheet()
+        header_format = workbook.add_format({'bold': True, 'border': 1, 'align': 'center'})
+
+        # constant_memory flushes each row once a later row is started, so rows go out in order
+        worksheet.write_row(0, 0, _header(df, index), header_format)
+        for row_number, row in enumerate(_iter_rows(df, chunk_size, index), start=1):
+            worksheet.write_row(row_number, 0, row)
+
+    finally:
+        workbook.close()
+
+
+def _write_excel_openpyxl(df: pd.DataFrame, path: str, chunk_size: int, index: bool) -> None:
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+
+    header = []
+    for name in _header(df, index):
+        cell = WriteOnlyCell(worksheet, value=name)
+        cell.font = Font(bold=True)
+        header.append(cell)
+
+    worksheet.append(header)
+    for row in _iter_rows(df, chunk_size, index):
+        worksheet.append(row)
+
+    workbook.save(path)
+
+
+def write_excel(df: pd.DataFrame, path: str, index: bool = False, chunk_size: int = 50_000) -> None:
+    """
+    Writes a DataFrame to .xlsx, streaming rows to disk instead of building a
+    cell object for every value.
+
+    Uses xlsxwriter's constant_memory mode when xlsxwriter is installed, and
+    openpyxl's write-only workbook otherwise.
+
+    Args:
+        df (pd.DataFrame): DataFrame to write.
+        path (str): Output .xlsx path.
+        index (bool): Whether to write the index as leading columns. Defaults to False.
+        chunk_size (int): Number of rows converted to Python objects at a time, which bounds
+                          the extra memory used on top of the DataFrame. Defaults to 50_000.
+
+    Raises:
+        ValueError: If the header and rows do not fit in one Excel worksheet.
+    """
+    # Neither engine raises on cells past the sheet limits (xlsxwriter skips them,
+    # openpyxl writes a file Excel cannot open), so check up front as pandas does
+    num_rows = len(df) + 1
+    num_cols = len(_header(df, index))
+    if num_rows > EXCEL_MAX_ROWS or num_cols > EXCEL_MAX_COLS:
+        logger.error("DataFrame of %s rows and %s columns does not fit in an Excel sheet.", num_rows, num_cols)
+        raise ValueError(
+            f"This sheet is too large! Your sheet size is: {num_rows}, {num_cols} "
+            f"Max sheet size is: {EXCEL_MAX_ROWS}, {EXCEL_MAX_COLS}"
+        )
+
+    if XLSXWRITER_AVAILABLE:
+        _write_excel_xlsxwriter(df, path, chunk_size, index)
+    else:
+        _write_excel_openpyxl(df, path, chunk_size, index)
+
+
+def save_dataframe(df: pd.DataFrame, path: str, index: bool = False) -> None:
+    """
+    Saves a DataFrame in the format given by the file extension.
+
+    Intermediate pipeline stages should use '.parquet' or '.feather', which are
+    columnar binary dumps; only user-facing reports need '.xlsx'.
+
+    Args:
+        df (pd.DataFrame): DataFrame to save.
+        path (str): Output path. '.parquet' and '.feather' are written with pyarrow,
+                    anything else is written as Excel.
+        index (bool): Whether to write the index. Defaults to False.
+
+    Notes:
+        - The file is written to a temporary path and then moved over `path`, so it is
+          safe to overwrite one of the pipeline's own input files.
+        - Parquet and Feather require string column names, so other column
+          names (e.g. numeric store codes) are written as strings.
+    """
+    root, extension = os.path.splitext(path)
+    extension = extension.lower()
+
+    if extension in ('.parquet', '.feather'):
+        if index:
+            df = df.reset_index()
+        if not all(isinstance(col, str) for col in df.columns):
+            df = df.rename(columns=str)
+
+    # Write next to the target and swap it in once complete, so a report written over
+    # one of its own inputs (or a failed write) never leaves a truncated file behind
+    temp_path = f"{root}.{os.getpid()}.tmp{extension}"
+
+    try:
+        if extension == '.parquet':
+            df.to_parquet(temp_path, engine='pyarrow', compression='snappy', index=False)
+        elif extension == '.feather':
+            df.reset_index(drop=True).to_feather(temp_path)
+        else:
+            write_excel(df, temp_path, index=index)
+
+        os.replace(temp_path, path)
+
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    logger.info("Successfully saved DataFrame to %s.", path)